@@ -1,12 +1,53 @@
+import atexit
+import csv
+import datetime
+import math
+import sys
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+FILE_NAME = "expenses.csv"
+ENCODING = "utf-8"  # used for every read and write of the file
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB, fewer read() calls when scanning the file
+WRITE_BUFFER_SIZE = 1 << 16  # 64 KiB for the append handle; add_expense flushes each row anyway
+
+MENU = (
+    "\n==== Expense Tracker ====\n"
+    "1. Add Expense\n"
+    "2. View All Expenses\n"
+    "3. Monthly Summary\n"
+    "4. Exit"
+)
+
+# Monthly totals in cents keyed by "YYYY-MM", built on the first summary request
+_monthly_cache = None
+
+# Append handle kept open for the whole session, opened by init_file
+_append_file = None
+_append_writer = None
+
+# Convert a typed amount to whole cents, rounding half a cent up
+def to_cents(amount):
+    return int((Decimal(amount) * 100).quantize(Decimal(1), ROUND_HALF_UP))
+
+# Format whole cents as a decimal amount, e.g. 1250 -> "12.50"
+def format_cents(cents):
+    return str(Decimal(cents).scaleb(-2))
+
 # Initialize CSV file with headers if it doesn't exist
 def init_file():
+    global _append_file, _append_writer
     try:
-        with open(FILE_NAME, "x", newline="") as file:
+        with open(FILE_NAME, "x", newline="", encoding=ENCODING) as file:
             writer = csv.writer(file)
             writer.writerow(["Date", "Category", "Amount", "Note"])
     except FileExistsError:
         pass
 
+    _append_file = open(FILE_NAME, "a", newline="", encoding=ENCODING, buffering=WRITE_BUFFER_SIZE)
+    _append_writer = csv.writer(_append_file)
+    atexit.register(_append_file.close)
+
 # Add new expense
 def add_expense():
     date = input("Enter date (YYYY-MM-DD) or press Enter for today: ")
@@ -14,53 +55,69 @@ def add_expense():
         date = datetime.date.today().isoformat()
 
     category = input("Enter category (Food, Travel, Shopping, etc.): ")
-    amount = float(input("Enter amount: "))
+    amount_cents = to_cents(input("Enter amount: "))
     note = input("Enter a note (optional): ")
 
-    with open(FILE_NAME, "a", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow([date, category, amount, note])
+    _append_writer.writerow([date, category, format_cents(amount_cents), note])
+    # Flush so view_expenses and later reads of the file see the new row
+    _append_file.flush()
+
+    if _monthly_cache is not None:
+        _monthly_cache[date[:7]] += amount_cents
 
     print("✅ Expense added successfully!")
 
 # View all expenses
 def view_expenses():
-    with open(FILE_NAME, "r") as file:
+    with open(FILE_NAME, "r", buffering=READ_BUFFER_SIZE, newline="", encoding=ENCODING) as file:
         reader = csv.reader(file)
+        # Let the stdout writer buffer the rows instead of a print() call per row
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        writer.writerows(reader)
+
+# Total every month in a single pass over the file
+def load_monthly_totals():
+    totals = defaultdict(int)
+
+    # Columns follow the header written by init_file: Date, Category, Amount, Note
+    with open(FILE_NAME, "r", buffering=READ_BUFFER_SIZE, newline="", encoding=ENCODING) as file:
+        reader = csv.reader(file)
+        next(reader, None)
         for row in reader:
-            print(row)
+            # Skip blank lines and records too short to have an Amount
+            if len(row) < 3:
+                continue
+            # Stored amounts have at most two decimals, so float rounding is exact here
+            amount = float(row[2])
+            # Skip nan/inf amounts older versions could write; they have no cent value
+            if math.isfinite(amount):
+                totals[row[0][:7]] += round(amount * 100)
+
+    return totals
 
 # Show monthly total
 def monthly_summary():
+    global _monthly_cache
     month = input("Enter month (YYYY-MM): ")
-    total = 0
 
-    with open(FILE_NAME, "r") as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            if row["Date"].startswith(month):
-                total += float(row["Amount"])
+    if _monthly_cache is None:
+        _monthly_cache = load_monthly_totals()
+    total_cents = _monthly_cache.get(month, 0)
 
-    print(f"💰 Total expenses for {month}: {total}")
+    print(f"💰 Total expenses for {month}: {format_cents(total_cents)}")
 
 # Main menu
 def main():
     init_file()
+    actions = {"1": add_expense, "2": view_expenses, "3": monthly_summary}
     while True:
-        print("\n==== Expense Tracker ====")
-        print("1. Add Expense")
-        print("2. View All Expenses")
-        print("3. Monthly Summary")
-        print("4. Exit")
+        print(MENU)
 
         choice = input("Choose an option: ")
 
-        if choice == "1":
-            add_expense()
-        elif choice == "2":
-            view_expenses()
-        elif choice == "3":
-            monthly_summary()
+        action = actions.get(choice)
+        if action is not None:
+            action()
         elif choice == "4":
             print("👋 Exiting... Have a nice day!")
             break
@@ -1,3 +1,7 @@
+"""
+Terminal Ludo game
+
+Run:
  python ludo_game.py
 
 Features:
@@ -25,19 +29,63 @@ HOME_STRETCH = 6      # number of squares from entry to finish (including finish
 TOKENS_PER_PLAYER = 4
 SAFE_SQUARES = {0, 8, 13, 21, 26, 34, 39, 47}  # common safe squares on many Ludo boards
 
-COLORS = ["Red", "Green", "Yellow", "Blue"]
+COLORS = ("Red", "Green", "Yellow", "Blue")
+
+DICE_FACES = range(1, 7)
+DICE_BUFFER_SIZE = 4096  # rolls drawn from the RNG at a time
 
 # Map each player index to their start square on the outer track (0..51)
-START_SQUARE = {
-    0: 0,    # Red
-    1: 13,   # Green
-    2: 26,   # Yellow
-    3: 39    # Blue
-}
+START_SQUARE = (
+    0,    # Red
+    13,   # Green
+    26,   # Yellow
+    39    # Blue
+)
 
 # Each player's home entry square is the square they must reach to enter their home stretch.
 # For player p, the home entry index is (START_SQUARE[p] - 1) % OUTER_TRACK
-HOME_ENTRY = {p: (START_SQUARE[p] - 1) % OUTER_TRACK for p in START_SQUARE}
+HOME_ENTRY = tuple((start - 1) % OUTER_TRACK for start in START_SQUARE)
+
+# Bit s is set when outer square s is safe; the per-player masks also include that player's start square
+SAFE_MASK = sum(1 << s for s in SAFE_SQUARES)
+PLAYER_SAFE_MASK = tuple(SAFE_MASK | (1 << start) for start in START_SQUARE)
+
+
+def local_distance_to_home_entry(player_idx: int, pos: int) -> int:
+    # Given pos on outer track, how many steps to reach home entry of player
+    if pos < 0 or pos >= OUTER_TRACK:
+        return 0
+    entry = HOME_ENTRY[player_idx]
+    if pos <= entry:
+        return entry - pos
+    return OUTER_TRACK - (pos - entry)
+
+
+def compute_destination(player_idx: int, pos: int, roll: int) -> Optional[int]:
+    """
+    Where a token of player_idx at pos ends up after roll, or None if it cannot move.
+    Positions use the Token encoding: -1 yard, 0..51 outer track, 52.. home stretch.
+    """
+    if pos == -1:
+        return START_SQUARE[player_idx] if roll == 6 else None
+    if pos < OUTER_TRACK:
+        steps_to_entry = local_distance_to_home_entry(player_idx, pos)
+        if roll <= steps_to_entry:
+            return (pos + roll) % OUTER_TRACK
+        # roll goes beyond entry; it must not overshoot the final stretch
+        over = roll - steps_to_entry - 1
+        return OUTER_TRACK + over if over < HOME_STRETCH else None
+    rel = pos - OUTER_TRACK
+    return pos + roll if rel + roll < HOME_STRETCH else None
+
+
+# DEST_TABLE[player_idx][pos + 1][roll] -> destination or None, precomputed for every
+# player, position (yard included, hence the +1 offset) and roll 1..6 (index 0 unused).
+DEST_TABLE = [
+    [[None] + [compute_destination(p, pos, roll) for roll in range(1, 7)]
+     for pos in range(-1, OUTER_TRACK + HOME_STRETCH)]
+    for p in range(len(START_SQUARE))
+]
 
 
 def debug_print(*args, **kwargs):
@@ -47,6 +95,8 @@ def debug_print(*args, **kwargs):
 
 
 class Token:
+    __slots__ = ("player_idx", "token_idx", "position", "finished")
+
     def __init__(self, player_idx: int, token_idx: int):
         self.player_idx = player_idx
         self.token_idx = token_idx
@@ -68,12 +118,18 @@ class Token:
 
 
 class Player:
+    __slots__ = ("idx", "name", "color", "tokens", "is_cpu", "n_in_yard", "n_on_board", "n_finished")
+
     def __init__(self, idx: int, name: str, is_cpu: bool = False):
         self.idx = idx
         self.name = name
         self.color = COLORS[idx]
         self.tokens = [Token(idx, i) for i in range(TOKENS_PER_PLAYER)]
         self.is_cpu = is_cpu
+        # Token counts by state, kept up to date by Game.move_token / Game.handle_capture
+        self.n_in_yard = TOKENS_PER_PLAYER
+        self.n_on_board = 0
+        self.n_finished = 0
 
     def tokens_in_play(self):
         return [t for t in self.tokens if not t.is_in_yard() and not t.finished]
@@ -85,24 +141,39 @@ class Player:
         return [t for t in self.tokens if t.finished]
 
     def all_finished(self):
-        return len(self.tokens_finished()) == TOKENS_PER_PLAYER
+        return self.n_finished == TOKENS_PER_PLAYER
 
     def __repr__(self):
         return f"{self.name}({self.color})"
 
 
 class Game:
-    def __init__(self, num_players: int = 4, cpu_players: Optional[List[bool]] = None):
+    def __init__(self, num_players: int = 4, cpu_players: Optional[List[bool]] = None, verbose: bool = True):
         assert 2 <= num_players <= 4, "Ludo needs 2-4 players"
         if cpu_players is None:
             cpu_players = [False] * num_players
         self.num_players = num_players
+        # Set to False for headless (e.g. CPU self-play) runs to skip all game output
+        self.verbose = verbose
         self.players = [Player(i, f"Player-{i+1}", is_cpu=cpu_players[i]) for i in range(num_players)]
+        # Every token in the game, in player order, for single-pass board scans
+        self.all_tokens = [t for p in self.players for t in p.tokens]
         self.turn = 0
         self.winner_order: List[Player] = []
+        self._rolls: List[int] = []
+        self._roll_idx = 0
+
+    def log(self, *args, **kwargs):
+        if self.verbose:
+            print(*args, **kwargs)
 
     def roll_dice(self) -> int:
-        v = random.randint(1, 6)
+        # Serve rolls from a pre-drawn batch, refilling it when it runs out
+        if self._roll_idx == len(self._rolls):
+            self._rolls = random.choices(DICE_FACES, k=DICE_BUFFER_SIZE)
+            self._roll_idx = 0
+        v = self._rolls[self._roll_idx]
+        self._roll_idx += 1
         debug_print(f"Dice rolled: {v}")
         return v
 
@@ -118,83 +189,36 @@ class Game:
         # Safe squares are fixed on outer track, and also player's own start square
         if pos < 0 or pos >= OUTER_TRACK:
             return False
-        if pos in SAFE_SQUARES:
-            return True
-        if player_idx is not None and pos == START_SQUARE[player_idx]:
-            return True
-        return False
-
-    def local_distance_to_home_entry(self, player_idx: int, pos: int) -> int:
-        # Given pos on outer track, how many steps to reach home entry of player
-        if pos < 0 or pos >= OUTER_TRACK:
-            return 0
-        entry = HOME_ENTRY[player_idx]
-        if pos <= entry:
-            return entry - pos
-        return OUTER_TRACK - (pos - entry)
+        mask = SAFE_MASK if player_idx is None else PLAYER_SAFE_MASK[player_idx]
+        return bool((mask >> pos) & 1)
 
     def can_move_token(self, player: Player, token: Token, roll: int) -> bool:
-        # If token in yard -> only a 6 can bring it out
-        if token.finished:
-            return False
-        if token.is_in_yard():
-            return roll == 6
-        # If on outer track
-        if 0 <= token.position < OUTER_TRACK:
-            steps_to_entry = self.local_distance_to_home_entry(player.idx, token.position)
-            if roll <= steps_to_entry:
-                return True
-            # roll goes beyond entry; ensure it does not overshoot final stretch
-            over = roll - steps_to_entry - 1
-            return over < HOME_STRETCH
-        # If on home stretch
-        if token.position >= OUTER_TRACK:
-            rel = token.position - OUTER_TRACK
-            return rel + roll < HOME_STRETCH
-        return False
+        # Finished tokens sit on the last home square, which has no destinations
+        return DEST_TABLE[player.idx][token.position + 1][roll] is not None
 
     def move_token(self, player: Player, token: Token, roll: int):
         debug_print(f"Moving token {token.token_idx} of {player.name} with roll {roll}")
+        dest = DEST_TABLE[player.idx][token.position + 1][roll]
+        if dest is None:
+            # overshoot: not allowed in many Ludo variants; here we disallow the move
+            debug_print("Move not allowed")
+            return
+
         if token.is_in_yard():
-            # Bring out
-            token.position = START_SQUARE[player.idx]
-            debug_print(f"Token brought out to {token.position}")
+            player.n_in_yard -= 1
+            player.n_on_board += 1
+        token.position = dest
+        if dest < OUTER_TRACK:
+            debug_print(f"Token moved on track to {dest}")
             self.handle_capture(player, token)
             return
 
-        if 0 <= token.position < OUTER_TRACK:
-            steps_to_entry = self.local_distance_to_home_entry(player.idx, token.position)
-            if roll <= steps_to_entry:
-                # Move on outer track
-                new_pos = (token.position + roll) % OUTER_TRACK
-                token.position = new_pos
-                debug_print(f"Token moved on track to {new_pos}")
-                self.handle_capture(player, token)
-                return
-            else:
-                # Move into home stretch
-                over = roll - steps_to_entry - 1
-                token.position = OUTER_TRACK + over
-                debug_print(f"Token moved into home stretch to {token.position}")
-                if token.position - OUTER_TRACK == HOME_STRETCH - 1:
-                    token.finished = True
-                    debug_print(f"Token finished!")
-                return
-
-        # If token is in home stretch
-        if token.position >= OUTER_TRACK:
-            rel = token.position - OUTER_TRACK
-            new_rel = rel + roll
-            if new_rel == HOME_STRETCH - 1:
-                token.position = OUTER_TRACK + new_rel
-                token.finished = True
-                debug_print("Token reached finish")
-            elif new_rel < HOME_STRETCH - 1:
-                token.position = OUTER_TRACK + new_rel
-                debug_print(f"Token moved in home stretch to {token.position}")
-            else:
-                # overshoot: not allowed in many Ludo variants; here we disallow the move
-                debug_print("Move overshoots finish: not allowed")
+        debug_print(f"Token moved in home stretch to {dest}")
+        if dest - OUTER_TRACK == HOME_STRETCH - 1:
+            token.finished = True
+            player.n_on_board -= 1
+            player.n_finished += 1
+            debug_print("Token reached finish")
 
     def handle_capture(self, player: Player, moved_token: Token):
         # If token lands on an opponent on outer track and not a safe square, capture them
@@ -204,16 +228,20 @@ class Game:
         if self.position_is_safe(pos, player.idx):
             debug_print("Landed on safe square; no capture")
             return
-        for pl in self.players:
-            if pl.idx == player.idx:
-                continue
-            for tok in pl.tokens:
-                if tok.is_on_board() and tok.position == pos:
-                    # capture
-                    tok.position = -1
-                    debug_print(f"Captured token of {pl.name} at {pos}")
+        # pos is on the outer track, so only tokens on the board can match it
+        for tok in self.all_tokens:
+            if tok.position == pos and tok.player_idx != player.idx:
+                # capture
+                pl = self.players[tok.player_idx]
+                tok.position = -1
+                pl.n_on_board -= 1
+                pl.n_in_yard += 1
+                debug_print(f"Captured token of {pl.name} at {pos}")
 
     def any_moves_available(self, player: Player, roll: int) -> bool:
+        # Without a 6, yard tokens can't leave, so a player with nothing on the board has no move
+        if roll != 6 and not player.n_on_board:
+            return False
         for tok in player.tokens:
             if self.can_move_token(player, tok, roll):
                 return True
@@ -230,24 +258,13 @@ class Game:
                 if t.position >= OUTER_TRACK and (t.position - OUTER_TRACK) + roll == HOME_STRETCH - 1:
                     return t
             # 2) move that captures
+            # Gather opponent squares once so each candidate is a single set lookup
+            occupied = {tok.position for tok in self.all_tokens
+                        if tok.player_idx != player.idx and 0 <= tok.position < OUTER_TRACK}
             for t in movable:
-                if t.is_in_yard():
-                    dest = START_SQUARE[player.idx]
-                elif 0 <= t.position < OUTER_TRACK:
-                    steps_to_entry = self.local_distance_to_home_entry(player.idx, t.position)
-                    if roll <= steps_to_entry:
-                        dest = (t.position + roll) % OUTER_TRACK
-                    else:
-                        dest = OUTER_TRACK + (roll - steps_to_entry - 1)
-                else:
-                    dest = t.position + roll
-                if dest < OUTER_TRACK and not self.position_is_safe(dest, player.idx):
-                    for pl in self.players:
-                        if pl.idx == player.idx:
-                            continue
-                        for tok in pl.tokens:
-                            if tok.is_on_board() and tok.position == dest:
-                                return t
+                dest = DEST_TABLE[player.idx][t.position + 1][roll]
+                if dest in occupied and not self.position_is_safe(dest, player.idx):
+                    return t
             # 3) bring out
             for t in movable:
                 if t.is_in_yard():
@@ -281,6 +298,8 @@ class Game:
                 return tok
 
     def print_board_state(self):
+        if not self.verbose:
+            return
         print("\n===== BOARD STATE =====")
         for p in self.players:
             tokens = []
@@ -294,12 +313,12 @@ class Game:
                 else:
                     s = f"H{t.position - OUTER_TRACK}"
                 tokens.append(s)
-            print(f"{p.name} ({p.color}): " + ", ".join(tokens) + f"  | Finished: {len(p.tokens_finished())}")
+            print(f"{p.name} ({p.color}): " + ", ".join(tokens) + f"  | Finished: {p.n_finished}")
         print("=======================\n")
 
     def play(self):
-        print("Welcome to Terminal Ludo!")
-        print("Rules: Roll a 6 to bring a token out. Capture by landing on opponent's token (not on safe squares). Finish when all your tokens reach home.)\n")
+        self.log("Welcome to Terminal Ludo!")
+        self.log("Rules: Roll a 6 to bring a token out. Capture by landing on opponent's token (not on safe squares). Finish when all your tokens reach home.)\n")
         while len(self.winner_order) < self.num_players - 1:
             player = self.players[self.turn]
             if player.all_finished():
@@ -308,34 +327,34 @@ class Game:
                 self.turn = (self.turn + 1) % self.num_players
                 continue
 
-            print(f"-- {player.name} ({player.color})'s turn --")
+            self.log(f"-- {player.name} ({player.color})'s turn --")
             self.print_board_state()
 
             extra_turn = False
             roll = self.roll_dice()
-            print(f"{player.name} rolled a {roll}")
+            self.log(f"{player.name} rolled a {roll}")
 
             if not self.any_moves_available(player, roll):
-                print("No moves available.")
+                self.log("No moves available.")
                 if roll == 6:
-                    print("But you rolled a 6, you get another turn.")
+                    self.log("But you rolled a 6, you get another turn.")
                     extra_turn = True
                 else:
                     extra_turn = False
             else:
                 tok = self.select_token_for_move(player, roll)
                 if tok is None:
-                    print("Player chose not to move any token.")
+                    self.log("Player chose not to move any token.")
                 else:
                     # move chosen token
                     self.move_token(player, tok, roll)
                     # check if finished player
                     if player.all_finished() and player not in self.winner_order:
-                        print(f"{player.name} has finished all tokens!" )
+                        self.log(f"{player.name} has finished all tokens!" )
                         self.winner_order.append(player)
                     # If rolled a 6, player gets another turn
                     if roll == 6:
-                        print("Rolled a 6: extra turn granted.")
+                        self.log("Rolled a 6: extra turn granted.")
                         extra_turn = True
 
             if not extra_turn:
@@ -345,10 +364,10 @@ class Game:
         for p in self.players:
             if p not in self.winner_order:
                 self.winner_order.append(p)
-        print("\n=== GAME OVER ===")
-        print("Final standings:")
+        self.log("\n=== GAME OVER ===")
+        self.log("Final standings:")
         for i, p in enumerate(self.winner_order, 1):
-            print(f" {i}. {p.name} ({p.color})")
+            self.log(f" {i}. {p.name} ({p.color})")
 
 
 def prompt_setup():